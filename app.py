@@ -1,11 +1,23 @@
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from controllers import parser, processing_controller, ats_score
+from helpers.serialization import dumps_json
+
+
+class FastJSONResponse(JSONResponse):
+    """API response rendered with `dumps_json` (orjson when available)."""
+
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
 
 app = FastAPI(
     title="ATS Resume Parser API",
     description="FastAPI backend for resume parsing, job description processing, and ATS score evaluation",
-    version="1.0.0"
+    version="1.0.0",
+    # Encode API responses with orjson when it is installed
+    default_response_class=FastJSONResponse
 )
 
 @app.get("/")
@@ -0,0 +1,454 @@
+# benchmarks/load_test.py
+"""
+Load-test harness and latency SLO gate for the ATS API.
+
+Replays a mixed workload (PDF uploads, scoring, repeated identical scoring
+requests) across several concurrency levels and reports latency histograms,
+percentiles and throughput. Embeddings use the stub backend so no model is
+downloaded.
+
+Usage (from the project root):
+    python benchmarks/load_test.py                          # in-process (ASGI transport)
+    python benchmarks/load_test.py --workers 1,2,4          # local uvicorn per worker count
+    python benchmarks/load_test.py --url http://127.0.0.1:3000
+    python benchmarks/load_test.py --update-baseline        # store results as the new baseline
+
+Exits with status 1 and a regression report when an SLO in benchmarks/slo.json
+is violated against benchmarks/baseline.json.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# ----------------------------
+# Config
+# ----------------------------
+BENCH_DIR = os.path.join(ROOT, "benchmarks")
+DEFAULT_SLO_PATH = os.path.join(BENCH_DIR, "slo.json")
+DEFAULT_BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+PROCESSED_DIR = os.path.join(ROOT, "data", "processed")
+UPLOAD_DIR = os.path.join(ROOT, "resumes")
+
+FILE_PREFIX = "loadtest_"
+DEFAULT_MIX = "parse:1,score:3,repeat:6"
+DEFAULT_CONCURRENCY = "1,4,16"
+# Enough that the lightest endpoint in DEFAULT_MIX (parse, 1/10) gets ~120 samples per level
+DEFAULT_REQUESTS = 1200
+# Below this many samples nearest-rank p99 is just the slowest request
+DEFAULT_MIN_P99_SAMPLES = 100
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf")]
+
+VOCAB = [
+    "python", "fastapi", "react", "typescript", "docker", "kubernetes", "aws", "postgresql",
+    "redis", "graphql", "microservices", "ci", "cd", "testing", "agile", "node.js", "django",
+    "machine", "learning", "api", "design", "scalable", "backend", "frontend", "cloud", "linux",
+    "git", "monitoring", "performance", "security", "data", "pipelines", "mentoring", "leadership"
+]
+
+RESUME_SECTIONS = ["summary", "skills", "experience", "projects", "achievements"]
+JD_SECTIONS = ["job description", "responsibilities", "qualifications", "skills required"]
+
+
+# -----------------------------------------------------
+# Workload fixtures
+# -----------------------------------------------------
+def _random_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCAB) for _ in range(words)) + "."
+
+
+def _document_text(rng: random.Random, headers: List[str], words_per_section: int) -> str:
+    return "\n".join(f"{h.title()}\n{_random_text(rng, words_per_section)}" for h in headers)
+
+
+def make_pdf(text: str) -> bytes:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(40, 40, 560, 800), text, fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def write_processed_fixtures(rng: random.Random, variants: int, fmt: str = None) -> Tuple[List[str], str]:
+    """Write processed resume/JD files straight to data/processed (no parsing or model needed)."""
+    from helpers.serialization import save_data, artifact_path
+
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+
+    def processed(name, sections):
+        return {
+            "file_name": f"{name}.pdf",
+            "processed_sections": [
+                {"id": f"{name}_{s}", "section": s, "text": _random_text(rng, 120)} for s in sections
+            ]
+        }
+
+    resume_files = []
+    for i in range(variants):
+        name = f"{FILE_PREFIX}resume_{i}"
+        path = save_data(processed(name, RESUME_SECTIONS), artifact_path(os.path.join(PROCESSED_DIR, f"{name}_processed"), fmt))
+        resume_files.append(os.path.basename(path))
+
+    jd_name = f"{FILE_PREFIX}jd"
+    jd_path = save_data(processed(jd_name, JD_SECTIONS), artifact_path(os.path.join(PROCESSED_DIR, f"{jd_name}_processed"), fmt))
+    return resume_files, os.path.basename(jd_path)
+
+
+def cleanup_fixtures() -> None:
+    for directory in (PROCESSED_DIR, UPLOAD_DIR):
+        if not os.path.isdir(directory):
+            continue
+        for f in os.listdir(directory):
+            if f.startswith(FILE_PREFIX):
+                os.remove(os.path.join(directory, f))
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition(":")
+        kind = kind.strip()
+        if kind not in ("parse", "score", "repeat"):
+            raise ValueError(f"Unknown workload kind: {kind}")
+        mix[kind] = int(weight or 1)
+    return mix
+
+
+def build_ops(rng: random.Random, mix: Dict[str, int], total: int) -> List[str]:
+    kinds = list(mix)
+    return rng.choices(kinds, weights=[mix[k] for k in kinds], k=total)
+
+
+# -----------------------------------------------------
+# Request execution
+# -----------------------------------------------------
+class Workload:
+    """Turns an op kind into an HTTP request against the prepared fixtures."""
+
+    def __init__(self, resume_files: List[str], jd_file: str, resume_pdf: bytes, jd_pdf: bytes):
+        self.resume_files = resume_files
+        self.jd_file = jd_file
+        self.resume_pdf = resume_pdf
+        self.jd_pdf = jd_pdf
+        self._counter = 0
+
+    async def send(self, client: httpx.AsyncClient, kind: str) -> httpx.Response:
+        self._counter += 1
+        n = self._counter
+        if kind == "parse":
+            files = {
+                "resume": (f"{FILE_PREFIX}r{n}.pdf", self.resume_pdf, "application/pdf"),
+                "jobD": (f"{FILE_PREFIX}jd{n}.pdf", self.jd_pdf, "application/pdf"),
+            }
+            return await client.post("/api/parse-resume", files=files)
+
+        # "repeat" always sends the identical request; "score" cycles through resume variants
+        resume = self.resume_files[0] if kind == "repeat" else self.resume_files[n % len(self.resume_files)]
+        params = {"resume_filename": resume, "jd_filename": self.jd_file}
+        return await client.get("/api/compute-ats-score", params=params)
+
+
+async def run_level(client: httpx.AsyncClient, workload: Workload, ops: List[str], concurrency: int) -> Dict:
+    queue = asyncio.Queue()
+    for op in ops:
+        queue.put_nowait(op)
+    samples = []  # (kind, latency_ms, ok)
+
+    async def worker():
+        while True:
+            try:
+                kind = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                resp = await workload.send(client, kind)
+                ok = resp.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            samples.append((kind, (time.perf_counter() - start) * 1000.0, ok))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    endpoints = {}
+    for kind in sorted({k for k, _, _ in samples}) + ["all"]:
+        selected = [(lat, ok) for k, lat, ok in samples if kind in ("all", k)]
+        endpoints[kind] = summarize(selected, duration)
+    return {"concurrency": concurrency, "duration_s": round(duration, 3), "endpoints": endpoints}
+
+
+# -----------------------------------------------------
+# Statistics
+# -----------------------------------------------------
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return 0.0
+    idx = max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+def histogram(values: List[float]) -> Dict[str, int]:
+    counts = {}
+    for upper in HISTOGRAM_BUCKETS_MS:
+        label = "inf" if upper == float("inf") else f"<={upper:g}ms"
+        counts[label] = 0
+    labels = list(counts)
+    for v in values:
+        for upper, label in zip(HISTOGRAM_BUCKETS_MS, labels):
+            if v <= upper:
+                counts[label] += 1
+                break
+    return counts
+
+
+def summarize(samples: List[Tuple[float, bool]], duration: float) -> Dict:
+    latencies = sorted(lat for lat, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "rps": round(len(samples) / duration, 2) if duration > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p90_ms": round(percentile(latencies, 90), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "histogram": histogram(latencies)
+    }
+
+
+# -----------------------------------------------------
+# Targets: in-process or local uvicorn
+# -----------------------------------------------------
+async def sweep(client: httpx.AsyncClient, workload: Workload, args, mix: Dict[str, int]) -> List[Dict]:
+    rng = random.Random(args.seed)
+    levels = []
+    for concurrency in args.concurrency:
+        # Warm up so model/JIT/first-request costs do not land in the measurement
+        await asyncio.gather(*(workload.send(client, "repeat") for _ in range(min(concurrency, 4))))
+        total = max(args.requests, concurrency * 4)
+        levels.append(await run_level(client, workload, build_ops(rng, mix, total), concurrency))
+    return levels
+
+
+async def run_in_process(workload: Workload, args, mix) -> List[Dict]:
+    from app import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+        return await sweep(client, workload, args, mix)
+
+
+async def run_against_url(url: str, workload: Workload, args, mix) -> List[Dict]:
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        return await sweep(client, workload, args, mix)
+
+
+def start_uvicorn(workers: int, port: int) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+           "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=dict(os.environ))
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited early with code {proc.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1.0).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not become ready within 60s")
+
+
+# -----------------------------------------------------
+# SLO gate
+# -----------------------------------------------------
+def load_json_file(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_slos(results: Dict[str, List[Dict]], baseline: Dict, slo: Dict) -> Tuple[List[str], List[str]]:
+    """Return human-readable (violations, warnings); violations is empty when everything passes."""
+    failures, warnings = [], []
+    min_p99_samples = slo.get("min_p99_samples", DEFAULT_MIN_P99_SAMPLES)
+    p99_tol = slo.get("p99_regression_pct", 20) / 100.0
+    rps_tol = slo.get("rps_regression_pct", 15) / 100.0
+    max_error_rate = slo.get("max_error_rate", 0.01)
+    max_p99 = slo.get("max_p99_ms", {})
+
+    for config, levels in results.items():
+        for level in levels:
+            c = str(level["concurrency"])
+            for kind, stats in level["endpoints"].items():
+                where = f"[{config} c={c} {kind}]"
+                if stats["error_rate"] > max_error_rate:
+                    failures.append(f"{where} error rate {stats['error_rate']:.2%} > {max_error_rate:.2%}")
+                base = baseline.get(config, {}).get(c, {}).get(kind)
+
+                p99_gated = stats["count"] >= min_p99_samples
+                if not p99_gated and (kind in max_p99 or base):
+                    warnings.append(
+                        f"{where} p99 not gated: {stats['count']} samples < {min_p99_samples} (raise --requests)"
+                    )
+                if p99_gated and kind in max_p99 and stats["p99_ms"] > max_p99[kind]:
+                    failures.append(f"{where} p99 {stats['p99_ms']}ms > SLO {max_p99[kind]}ms")
+
+                if not base:
+                    continue
+                if p99_gated and stats["p99_ms"] > base["p99_ms"] * (1 + p99_tol):
+                    failures.append(
+                        f"{where} p99 regressed {base['p99_ms']}ms -> {stats['p99_ms']}ms (>{p99_tol:.0%})"
+                    )
+                if stats["rps"] < base["rps"] * (1 - rps_tol):
+                    failures.append(
+                        f"{where} throughput regressed {base['rps']} -> {stats['rps']} req/s (>{rps_tol:.0%})"
+                    )
+    return failures, warnings
+
+
+def baseline_from_results(results: Dict[str, List[Dict]]) -> Dict:
+    return {
+        config: {
+            str(level["concurrency"]): {
+                kind: {"p99_ms": stats["p99_ms"], "rps": stats["rps"]}
+                for kind, stats in level["endpoints"].items()
+            }
+            for level in levels
+        }
+        for config, levels in results.items()
+    }
+
+
+# -----------------------------------------------------
+# Reporting
+# -----------------------------------------------------
+def print_report(results: Dict[str, List[Dict]]) -> None:
+    for config, levels in results.items():
+        print(f"\n=== {config} ===")
+        print(f"{'conc':>5} {'endpoint':<8} {'n':>6} {'err':>5} {'req/s':>9} {'p50':>9} {'p90':>9} {'p99':>9}")
+        for level in levels:
+            for kind, s in level["endpoints"].items():
+                print(f"{level['concurrency']:>5} {kind:<8} {s['count']:>6} {s['errors']:>5} {s['rps']:>9.1f} "
+                      f"{s['p50_ms']:>8.1f}ms {s['p90_ms']:>7.1f}ms {s['p99_ms']:>7.1f}ms")
+
+        print("\nThroughput curve (all endpoints):")
+        peak = max((lv["endpoints"]["all"]["rps"] for lv in levels), default=0) or 1
+        for level in levels:
+            rps = level["endpoints"]["all"]["rps"]
+            print(f"  c={level['concurrency']:<4} {'#' * int(40 * rps / peak):<40} {rps:.1f} req/s")
+
+        top = levels[-1]
+        print(f"\nLatency histogram (c={top['concurrency']}, all endpoints):")
+        hist = top["endpoints"]["all"]["histogram"]
+        widest = max(hist.values()) or 1
+        for label, count in hist.items():
+            print(f"  {label:>9} {'#' * int(40 * count / widest):<40} {count}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Load test the ATS API and gate on latency SLOs.")
+    ap.add_argument("--url", help="Target an already running server instead of running in-process.")
+    ap.add_argument("--workers", help="Comma-separated uvicorn worker counts to spawn locally, e.g. 1,2,4.")
+    ap.add_argument("--port", type=int, default=3100, help="Port for spawned uvicorn servers.")
+    ap.add_argument("--concurrency", default=DEFAULT_CONCURRENCY, help="Comma-separated concurrency levels.")
+    ap.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="Requests per concurrency level.")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help="Workload weights, e.g. parse:1,score:3,repeat:6.")
+    ap.add_argument("--variants", type=int, default=8, help="Distinct resumes for the 'score' workload.")
+    ap.add_argument("--format", dest="fmt", choices=["json", "msgpack"], help="Format of processed fixtures.")
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--slo", default=DEFAULT_SLO_PATH, help="SLO thresholds JSON.")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Stored baseline JSON.")
+    ap.add_argument("--update-baseline", action="store_true", help="Write results to the baseline file.")
+    ap.add_argument("--output", help="Write the full JSON report here.")
+    args = ap.parse_args(argv)
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+
+    # Offline: never download the embedding model, in-process or in spawned servers
+    os.environ.setdefault("ATS_EMBEDDING_BACKEND", "stub")
+    # The app writes to paths relative to the working directory
+    os.chdir(ROOT)
+
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    resume_files, jd_file = write_processed_fixtures(rng, args.variants, args.fmt)
+    resume_pdf = make_pdf(_document_text(rng, RESUME_SECTIONS, 150)) if "parse" in mix else b""
+    jd_pdf = make_pdf(_document_text(rng, JD_SECTIONS, 100)) if "parse" in mix else b""
+
+    results = {}
+    try:
+        if args.url:
+            workload = Workload(resume_files, jd_file, resume_pdf, jd_pdf)
+            results["url"] = asyncio.run(run_against_url(args.url, workload, args, mix))
+        elif args.workers:
+            for workers in (int(w) for w in args.workers.split(",")):
+                proc = start_uvicorn(workers, args.port)
+                try:
+                    workload = Workload(resume_files, jd_file, resume_pdf, jd_pdf)
+                    url = f"http://127.0.0.1:{args.port}"
+                    results[f"workers={workers}"] = asyncio.run(run_against_url(url, workload, args, mix))
+                finally:
+                    proc.terminate()
+                    proc.wait(timeout=30)
+        else:
+            workload = Workload(resume_files, jd_file, resume_pdf, jd_pdf)
+            results["inprocess"] = asyncio.run(run_in_process(workload, args, mix))
+    finally:
+        cleanup_fixtures()
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = load_json_file(args.baseline, {})
+        baseline.update(baseline_from_results(results))
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_json_file(args.baseline, {})
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; only absolute SLOs were checked.")
+    failures, warnings = check_slos(results, baseline, load_json_file(args.slo, {}))
+    if warnings:
+        print("\nWarnings:")
+        for warning in warnings:
+            print(f"  - {warning}")
+    if failures:
+        print(f"\nSLO REGRESSION ({len(failures)} violation(s)):")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nAll SLOs met.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# benchmarks/memory_benchmark.py
+"""
+Peak-memory benchmark for the streaming parse/chunk/embed pipeline.
+
+Runs each stage on synthetic documents of increasing size and measures the
+peak Python heap with tracemalloc. Bounded stages (sections->chunks and
+embedding) must stay flat as the document grows. The other two are reported
+for reference and grow with the document: pdf extract returns per-chunk
+metadata for every chunk, and process keeps each section's full text in the
+processed artifact. Embeddings use the stub backend so no model is downloaded.
+
+Usage (from the project root):
+    python benchmarks/memory_benchmark.py
+    python benchmarks/memory_benchmark.py --pages 10,50,200,1000
+
+Exits with status 1 when a bounded stage's peak grows with document size.
+"""
+
+import os
+import sys
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from itertools import groupby
+from typing import Callable, Dict, Iterator, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# ----------------------------
+# Config
+# ----------------------------
+DEFAULT_PAGES = "10,50,200"
+LINES_PER_PAGE = 50
+WORDS_PER_LINE = 12
+# A streaming stage may use at most this multiple of its smallest-document peak (plus slack)
+GROWTH_LIMIT = 1.5
+GROWTH_SLACK_BYTES = 256 * 1024
+
+VOCAB = [
+    "python", "fastapi", "react", "typescript", "docker", "kubernetes", "aws", "postgresql",
+    "redis", "graphql", "microservices", "testing", "agile", "django", "machine", "learning",
+    "design", "scalable", "backend", "frontend", "cloud", "linux", "monitoring", "performance"
+]
+HEADERS = ["Summary", "Skills", "Experience", "Projects", "Achievements"]
+
+
+# -----------------------------------------------------
+# Synthetic documents
+# -----------------------------------------------------
+def iter_document_lines(pages: int, seed: int = 7) -> Iterator[str]:
+    """Lines of a `pages`-page resume, generated lazily so the input itself is not held."""
+    rng = random.Random(seed)
+    for page in range(pages):
+        if page % 10 == 0:
+            yield HEADERS[(page // 10) % len(HEADERS)]
+        for _ in range(LINES_PER_PAGE):
+            words = [rng.choice(VOCAB) for _ in range(WORDS_PER_LINE)]
+            yield " ".join(words) + ("." if rng.random() < 0.3 else "")
+
+
+def make_pdf(path: str, pages: int) -> None:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    lines = iter_document_lines(pages)
+    for _ in range(pages):
+        page = doc.new_page()
+        text = "\n".join(next(lines) for _ in range(LINES_PER_PAGE))
+        page.insert_textbox(fitz.Rect(30, 30, 580, 810), text, fontsize=6)
+    doc.save(path)
+    doc.close()
+
+
+# -----------------------------------------------------
+# Stages
+# -----------------------------------------------------
+def stage_sections_to_chunks(pages: int, workdir: str) -> int:
+    from helpers.file_utils import split_into_sections, chunk_text_for_embeddings, SECTION_HEADERS
+
+    chunks = 0
+    sections = split_into_sections(iter_document_lines(pages), SECTION_HEADERS)
+    for _, section_lines in groupby(sections, key=lambda item: item[0]):
+        for _ in chunk_text_for_embeddings(line for _, line in section_lines):
+            chunks += 1
+    return chunks
+
+
+def stage_embedding(pages: int, workdir: str) -> int:
+    from helpers.embedding_utils import embed_text_chunks
+
+    embedding = embed_text_chunks(iter_document_lines(pages))
+    return int(embedding.shape[0])
+
+
+def stage_pdf_extract(pages: int, workdir: str) -> int:
+    from helpers import file_utils
+
+    pdf_path = os.path.join(workdir, f"bench_{pages}.pdf")
+    file_utils.UPLOAD_DIR = os.path.join(workdir, "uploads")
+    return file_utils.extract_text_from_pdf(pdf_path)["metadata"]["total_chunks"]
+
+
+def stage_process(pages: int, workdir: str) -> int:
+    from helpers.processing_pipeline import process_resume_json
+    from helpers.serialization import artifact_path, load_data
+
+    # Reads the structured artifact written by the pdf extract stage (run before this one)
+    structured = artifact_path(os.path.join(workdir, "uploads", f"bench_{pages}_structured"))
+    output = process_resume_json(structured, output_dir=os.path.join(workdir, "processed"))
+    return len(load_data(output)["processed_sections"])
+
+
+# (name, function, must stay bounded); order matters: process reads pdf extract's output
+STAGES = [
+    ("sections->chunks", stage_sections_to_chunks, True),
+    ("embedding (stub)", stage_embedding, True),
+    ("pdf extract", stage_pdf_extract, False),
+    ("process", stage_process, False),
+]
+
+
+def measure(stage: Callable[[int, str], int], pages: int, workdir: str) -> int:
+    tracemalloc.start()
+    try:
+        stage(pages, workdir)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Measure peak memory of the streaming pipeline stages.")
+    ap.add_argument("--pages", default=DEFAULT_PAGES, help="Comma-separated document sizes in pages.")
+    ap.add_argument("--growth-limit", type=float, default=GROWTH_LIMIT)
+    args = ap.parse_args(argv)
+    sizes = [int(p) for p in args.pages.split(",")]
+
+    os.environ.setdefault("ATS_EMBEDDING_BACKEND", "stub")
+    # Import (and load the encoder) up front so module-level allocations are not measured
+    import helpers.file_utils  # noqa: F401
+    import helpers.embedding_utils  # noqa: F401
+
+    workdir = tempfile.mkdtemp(prefix="ats_membench_")
+    failures: List[str] = []
+    try:
+        for pages in sizes:
+            make_pdf(os.path.join(workdir, f"bench_{pages}.pdf"), pages)
+
+        print(f"{'stage':<18} " + " ".join(f"{p:>8}p" for p in sizes) + "  bounded")
+        for name, stage, bounded in STAGES:
+            # Warm-up run so lazy imports and caches do not count as growth
+            stage(sizes[0], workdir)
+            peaks: Dict[int, int] = {pages: measure(stage, pages, workdir) for pages in sizes}
+            print(f"{name:<18} " + " ".join(f"{peaks[p] / 1024 / 1024:>7.2f}MB" for p in sizes)
+                  + ("  yes" if bounded else "  no (reference)"))
+
+            if bounded:
+                limit = peaks[sizes[0]] * args.growth_limit + GROWTH_SLACK_BYTES
+                for pages in sizes[1:]:
+                    if peaks[pages] > limit:
+                        failures.append(
+                            f"{name}: {pages}-page peak {peaks[pages] / 1024:.0f}KB exceeds "
+                            f"{limit / 1024:.0f}KB ({args.growth_limit}x the {sizes[0]}-page peak)"
+                        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failures:
+        print("\nMEMORY REGRESSION:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nBounded stages stay flat; reference stages grow with document size.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, HTTPException, Query
-import os, json
-from helpers.embedding_utils import ats_score_from_json
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import anyio
+import asyncio
+import os
+import threading
+from typing import List, Optional
+from helpers.embedding_utils import ats_score_from_json, precompute_jd_embeddings
+from helpers.bulk_scoring import DEFAULT_BATCH_SIZE, TopKRanking, iter_batches, score_batch
+from helpers.serialization import load_data, dumps_json, SerializationError
 
 router = APIRouter()
 DATA_DIR = os.path.join("data", "processed")
+DISCONNECT_POLL_SECONDS = 0.1
 
 
 @router.get("/compute-ats-score")
@@ -13,7 +22,7 @@ async def compute_ats_score(
 ):
     """
     Compute ATS similarity score between processed resume and JD JSONs.
-    Allows passing custom filenames for flexibility.
+    Allows passing custom filenames for flexibility (JSON or msgpack).
     """
     try:
         resume_path = os.path.join(DATA_DIR, resume_filename)
@@ -25,16 +34,91 @@ async def compute_ats_score(
                 detail=f"One or both files not found in {DATA_DIR}"
             )
 
-        with open(resume_path, "r", encoding="utf-8") as f:
-            resume_data = json.load(f)
-        with open(jd_path, "r", encoding="utf-8") as f:
-            jd_data = json.load(f)
+        resume_data = load_data(resume_path)
+        jd_data = load_data(jd_path)
 
         result = ats_score_from_json(resume_data, jd_data)
 
         return {"message": "ATS score computed successfully", "data": result}
 
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON format in processed files.")
+    except SerializationError:
+        raise HTTPException(status_code=400, detail="Invalid format in processed files.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error computing ATS score: {str(e)}")
+
+
+@router.get("/compute-ats-score/stream")
+async def stream_bulk_ats_scores(
+    request: Request,
+    jd_filename: str = Query("Full_Stack_Developer_Job_Description_processed.json"),
+    resume_filenames: List[str] = Query(...),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=256),
+    top_k: Optional[int] = Query(None, ge=1)
+):
+    """
+    Rank many processed resumes against one JD, streaming NDJSON as batches are scored.
+    `resume_filenames` is required: processed JDs and resumes share the same naming,
+    so candidates cannot be told apart by listing data/processed. Repeats are scored once.
+    With `top_k`, each batch emits the refined top-k ranking instead of per-resume results.
+    Scoring stops as soon as the client disconnects.
+    """
+    jd_path = os.path.join(DATA_DIR, jd_filename)
+    if not os.path.exists(jd_path):
+        raise HTTPException(status_code=404, detail=f"JD file not found in {DATA_DIR}")
+
+    try:
+        jd_data = load_data(jd_path)
+    except SerializationError:
+        raise HTTPException(status_code=400, detail="Invalid format in JD file.")
+
+    resume_filenames = list(dict.fromkeys(resume_filenames))
+    resume_paths = (os.path.join(DATA_DIR, f) for f in resume_filenames)
+
+    async def ndjson_stream():
+        ranking = TopKRanking(top_k) if top_k else None
+        scored, errors = 0, 0
+        # Encode the JD once for the whole stream instead of once per resume
+        jd_embeddings = await run_in_threadpool(precompute_jd_embeddings, jd_data)
+        # Set on disconnect/cancellation; score_batch checks it before each resume
+        cancelled = threading.Event()
+
+        async def watch_disconnect():
+            while not cancelled.is_set():
+                if await request.is_disconnected():
+                    cancelled.set()
+                    return
+                await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            for batch in iter_batches(resume_paths, batch_size):
+                if cancelled.is_set() or await request.is_disconnected():
+                    return
+
+                # Scoring is CPU-bound; keep it off the event loop. abandon_on_cancel lets a
+                # disconnect cancel this await at once, so `finally` can stop the worker thread.
+                records = await anyio.to_thread.run_sync(
+                    score_batch, jd_data, batch, True, jd_embeddings, cancelled,
+                    abandon_on_cancel=True
+                )
+
+                for record in records:
+                    if record["type"] == "error":
+                        errors += 1
+                        yield dumps_json(record) + b"\n"
+                        continue
+                    scored += 1
+                    if ranking is None:
+                        yield dumps_json(record) + b"\n"
+                    else:
+                        ranking.push(record)
+
+                if ranking is not None:
+                    yield dumps_json({"type": "top_k", "scored": scored, "ranking": ranking.ranking()}) + b"\n"
+
+            yield dumps_json({"type": "summary", "scored": scored, "errors": errors}) + b"\n"
+        finally:
+            cancelled.set()
+            watcher.cancel()
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from helpers.processing_pipeline import process_resume_json
 import os
+from typing import Literal, Optional
 
 router = APIRouter(prefix="/resume", tags=["Resume Processing"])
 
@@ -8,15 +9,16 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # root o
 RESUME_DIR = os.path.join(BASE_DIR, "resumes")
 
 @router.post("/process")
-def process_resume(file_name: str):
+def process_resume(file_name: str, fmt: Optional[Literal["json", "msgpack"]] = None, include_embeddings: bool = False):
     """
     Triggers post-processing for a given resume JSON file.
     Example: POST /api/resume/process?file_name=Sujay_Kumar_structured.json
+    Pass fmt=msgpack (and include_embeddings=true) for the compact binary output.
     """
     input_path = os.path.join(RESUME_DIR, file_name)
 
     if not os.path.exists(input_path):
         return {"error": f"File not found: {input_path}"}
 
-    output_path = process_resume_json(input_path)
+    output_path = process_resume_json(input_path, fmt=fmt, include_embeddings=include_embeddings)
     return {"message": "Processing complete", "output_file": output_path}
@@ -0,0 +1,87 @@
+# helpers/bulk_scoring.py
+
+import os
+import heapq
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import torch
+
+from helpers.embedding_utils import compute_sectionwise_scores
+from helpers.serialization import load_data
+
+# ----------------------------
+# Config
+# ----------------------------
+DEFAULT_BATCH_SIZE = 8
+
+
+# -----------------------------------------------------
+# Batching
+# -----------------------------------------------------
+def iter_batches(items: Iterable, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List]:
+    """Yield lists of up to `batch_size` items without materialising the whole input."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def score_batch(jd_data: Dict, resume_paths: List[str], use_keyword_blend: bool = True,
+                jd_embeddings: Optional[Dict[str, torch.Tensor]] = None,
+                cancelled: Optional[threading.Event] = None) -> List[Dict]:
+    """
+    Score a batch of processed resume files against one JD.
+    Resumes are loaded per batch so only `batch_size` candidates are held at once;
+    a file that fails to load or score yields an error record instead of aborting the batch.
+    Pass `jd_embeddings` (precompute_jd_embeddings) so the JD is encoded once per stream.
+    When `cancelled` is set, the remaining resumes are skipped.
+    """
+    records = []
+    for path in resume_paths:
+        if cancelled is not None and cancelled.is_set():
+            break
+        filename = os.path.basename(path)
+        try:
+            resume_data = load_data(path)
+            overall_pct, details = compute_sectionwise_scores(resume_data, jd_data, use_keyword_blend, jd_embeddings)
+        except Exception as e:
+            records.append({"type": "error", "resume_filename": filename, "error": str(e)})
+            continue
+
+        records.append({
+            "type": "result",
+            "resume_filename": filename,
+            "ats_score": overall_pct,
+            "details": details
+        })
+    return records
+
+
+# -----------------------------------------------------
+# Bounded top-k ranking
+# -----------------------------------------------------
+class TopKRanking:
+    """Keeps the `k` best-scoring records seen so far in a min-heap (O(k) memory)."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+        self._seq = 0  # tie-breaker so records themselves are never compared
+
+    def push(self, record: Dict) -> None:
+        entry = (record["ats_score"], -self._seq, record)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def ranking(self) -> List[Dict]:
+        """Current top-k, best first (earlier candidates win ties)."""
+        ordered = sorted(self._heap, key=lambda e: e[:2], reverse=True)
+        return [{"rank": i + 1, **record} for i, (_, _, record) in enumerate(ordered)]
@@ -1,6 +1,7 @@
 import re
 import os
-from typing import Dict, List, Tuple, Optional
+import zlib
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Union
 
 import numpy as np
 import torch
@@ -10,7 +11,12 @@ from sentence_transformers import SentenceTransformer, util
 # Configuration
 # -------------------------
 MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+# "stub" swaps the model for a deterministic hashing encoder (offline load tests)
+EMBEDDING_BACKEND = os.getenv("ATS_EMBEDDING_BACKEND", "sentence-transformers").lower()
+STUB_EMBEDDING_DIM = 768
+STUB_ENCODER_NAME = "stub-hashing"
 CHUNK_WORD_SIZE = 180
+EMBED_BATCH_SIZE = 16  # chunks encoded per model call
 KEYWORD_BLEND = 0.15
 
 SECTION_MAPPING = {
@@ -21,6 +27,8 @@ SECTION_MAPPING = {
     "achievements": ["qualifications", "responsibilities", "experience"]
 }
 
+JD_ALL_KEY = "all_jd"  # whole-JD embedding used for fallback matching
+
 SECTION_WEIGHTS = {
     "skills": 0.35,
     "experience": 0.35,
@@ -32,8 +40,43 @@ SECTION_WEIGHTS = {
 # -------------------------
 # Model load (global)
 # -------------------------
+class StubEncoder:
+    """Hashed bag-of-words encoder with the SentenceTransformer surface we use; no model download."""
+
+    def __init__(self, dim: int = STUB_EMBEDDING_DIM, device: str = "cpu"):
+        self.dim = dim
+        self.device = device
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, sentences, convert_to_tensor: bool = False, show_progress_bar: bool = False, **kwargs):
+        single = isinstance(sentences, str)
+        batch = [sentences] if single else list(sentences)
+        out = np.zeros((len(batch), self.dim), dtype=np.float32)
+        for row, text in enumerate(batch):
+            for token in text.lower().split():
+                out[row, zlib.crc32(token.encode("utf-8")) % self.dim] += 1.0
+            norm = np.linalg.norm(out[row])
+            if norm > 0:
+                out[row] /= norm
+        if single:
+            out = out[0]
+        return torch.from_numpy(out).to(self.device) if convert_to_tensor else out
+
+
 _device = "cuda" if torch.cuda.is_available() else "cpu"
-_model = SentenceTransformer(MODEL_NAME, device=_device)
+if EMBEDDING_BACKEND == "stub":
+    _model = StubEncoder(device=_device)
+    ENCODER_NAME = STUB_ENCODER_NAME
+else:
+    _model = SentenceTransformer(MODEL_NAME, device=_device)
+    ENCODER_NAME = MODEL_NAME
+
+
+def encoder_info() -> Dict:
+    """Identity of the active encoder, stored next to saved embeddings."""
+    return {"embedding_model": ENCODER_NAME, "embedding_dim": _model.get_sentence_embedding_dimension()}
 
 # -------------------------
 # Utilities
@@ -49,25 +92,45 @@ def clean_text(text: str) -> str:
     return text
 
 
-def chunk_text_words(text: str, chunk_size: int = CHUNK_WORD_SIZE) -> List[str]:
-    words = text.split()
-    if not words:
-        return []
-    if len(words) <= chunk_size:
-        return [" ".join(words)]
-    return [" ".join(words[i:i + chunk_size]) for i in range(0, len(words), chunk_size)]
-
-
-def embed_text_chunks(text: str, chunk_size: int = CHUNK_WORD_SIZE) -> torch.Tensor:
-    """Chunk long text, embed, return mean embedding tensor."""
-    chunks = chunk_text_words(text, chunk_size)
-    if not chunks:
+def chunk_text_words(text: Union[str, Iterable[str]], chunk_size: int = CHUNK_WORD_SIZE) -> Iterator[str]:
+    """Yield `chunk_size`-word chunks, scanning text (or a stream of text pieces) lazily."""
+    pieces = [text] if isinstance(text, str) else text
+    words = []
+    for piece in pieces:
+        for match in re.finditer(r"\S+", piece):
+            words.append(match.group())
+            if len(words) == chunk_size:
+                yield " ".join(words)
+                words = []
+    if words:
+        yield " ".join(words)
+
+
+def embed_chunk_stream(chunks: Iterable[str], batch_size: int = EMBED_BATCH_SIZE) -> torch.Tensor:
+    """Encode chunks in mini-batches and return their mean embedding via a running sum."""
+    total, count, batch = None, 0, []
+
+    def flush(total, batch):
+        embeddings = _model.encode(batch, convert_to_tensor=True, show_progress_bar=False)
+        batch_sum = embeddings.sum(dim=0)
+        return batch_sum if total is None else total + batch_sum
+
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) == batch_size:
+            total, count, batch = flush(total, batch), count + len(batch), []
+    if batch:
+        total, count = flush(total, batch), count + len(batch)
+
+    if total is None:
         dim = _model.get_sentence_embedding_dimension()
         return torch.zeros(dim, device=_device)
-    embeddings = _model.encode(chunks, convert_to_tensor=True, show_progress_bar=False)
-    if embeddings.dim() == 1:
-        return embeddings
-    return torch.mean(embeddings, dim=0)
+    return total / count
+
+
+def embed_text_chunks(text: Union[str, Iterable[str]], chunk_size: int = CHUNK_WORD_SIZE) -> torch.Tensor:
+    """Chunk long text, embed in mini-batches, return mean embedding tensor."""
+    return embed_chunk_stream(chunk_text_words(text, chunk_size))
 
 
 def safe_cosine(a: torch.Tensor, b: torch.Tensor) -> float:
@@ -112,17 +175,73 @@ def extract_sections_map(data: Dict) -> Dict[str, str]:
     return out
 
 
-def compute_sectionwise_scores(resume_data: Dict, jd_data: Dict, use_keyword_blend: bool = True) -> Tuple[float, List[Dict]]:
-    """Compute weighted section-wise ATS similarity (with fallback JD matching)."""
+def extract_section_embeddings(data: Dict) -> Dict[str, torch.Tensor]:
+    """
+    Turn stored per-section `embedding` vectors (process_resume_json with
+    include_embeddings) into {section_lower: tensor}, keyed like extract_sections_map.
+    Vectors from a different encoder (or untagged ones) are ignored so those
+    sections are re-encoded from their text.
+    """
+    active = encoder_info()
+    out = {}
+    for s in data.get("processed_sections", []):
+        sec = (s.get("section") or "").lower().strip()
+        if not clean_text(s.get("text") or ""):
+            continue
+        embedding = s.get("embedding")
+        meta = s.get("metadata") or {}
+        if embedding is not None and (
+            meta.get("embedding_model") != active["embedding_model"]
+            or meta.get("embedding_dim") != active["embedding_dim"]
+            or len(embedding) != active["embedding_dim"]
+        ):
+            embedding = None
+        if embedding is None:
+            out.pop(sec, None)  # a later duplicate section without a vector wins, as in extract_sections_map
+        else:
+            out[sec] = torch.tensor(embedding, dtype=torch.float32, device=_device)
+    return out
+
+
+def section_embedding(section: str, sections: Dict[str, str], stored: Dict[str, torch.Tensor]) -> torch.Tensor:
+    """Stored embedding for `section` when present, otherwise encode its cleaned text."""
+    if section in stored:
+        return stored[section]
+    return embed_text_chunks(sections[section])
+
+
+def precompute_jd_embeddings(jd_data: Dict) -> Dict[str, torch.Tensor]:
+    """
+    Embed every mapped JD section plus the whole JD (under JD_ALL_KEY) once,
+    for scoring many resumes against the same JD.
+    """
+    jd_sections = extract_sections_map(jd_data)
+    jd_stored = extract_section_embeddings(jd_data)
+    targets = {sec for secs in SECTION_MAPPING.values() for sec in secs}
+
+    out = {sec: section_embedding(sec, jd_sections, jd_stored) for sec in jd_sections if sec in targets}
+    out[JD_ALL_KEY] = embed_text_chunks(" ".join(jd_sections.values()))
+    return out
+
+
+def compute_sectionwise_scores(resume_data: Dict, jd_data: Dict, use_keyword_blend: bool = True,
+                               jd_embeddings: Optional[Dict[str, torch.Tensor]] = None) -> Tuple[float, List[Dict]]:
+    """
+    Compute weighted section-wise ATS similarity (with fallback JD matching).
+    `jd_embeddings` (from precompute_jd_embeddings) skips re-encoding the JD.
+    """
     resume_sections = extract_sections_map(resume_data)
     jd_sections = extract_sections_map(jd_data)
 
     if not resume_sections or not jd_sections:
         return 0.0, []
 
+    resume_stored = extract_section_embeddings(resume_data)
+    jd_stored = jd_embeddings if jd_embeddings is not None else extract_section_embeddings(jd_data)
+
     # Precompute global JD embedding (for fallback)
     jd_all_text = " ".join(jd_sections.values())
-    jd_all_emb = embed_text_chunks(jd_all_text)
+    jd_all_emb = jd_stored[JD_ALL_KEY] if JD_ALL_KEY in jd_stored else embed_text_chunks(jd_all_text)
 
     details, total_weight, weighted_sum = [], 0.0, 0.0
 
@@ -141,7 +260,7 @@ def compute_sectionwise_scores(resume_data: Dict, jd_data: Dict, use_keyword_ble
             })
             continue
 
-        r_emb = embed_text_chunks(r_text)
+        r_emb = section_embedding(r_section, resume_sections, resume_stored)
         best_sem_sim, best_j_sec, best_keyword_pct = -1.0, None, 0.0
 
         # Check section-to-section mappings first
@@ -149,7 +268,7 @@ def compute_sectionwise_scores(resume_data: Dict, jd_data: Dict, use_keyword_ble
             j_text = jd_sections.get(j_sec, "")
             if not j_text:
                 continue
-            j_emb = embed_text_chunks(j_text)
+            j_emb = section_embedding(j_sec, jd_sections, jd_stored)
             sem_sim = safe_cosine(r_emb, j_emb)
             sem_sim_norm = (sem_sim + 1.0) / 2.0
             if sem_sim_norm > best_sem_sim:
@@ -163,7 +282,7 @@ def compute_sectionwise_scores(resume_data: Dict, jd_data: Dict, use_keyword_ble
             sem_sim_global_norm = (sem_sim_global + 1.0) / 2.0
             if sem_sim_global_norm > best_sem_sim:
                 best_sem_sim = sem_sim_global_norm
-                best_j_sec = "all_jd"
+                best_j_sec = JD_ALL_KEY
                 best_keyword_pct = keyword_overlap_pct(r_text, jd_all_text)
 
         # Blending logic
@@ -238,7 +357,8 @@ def semantic_skill_gap(resume_data: Dict, jd_data: Dict, threshold: float = 0.6)
             "total_jd_skills": len(jd_skills)
         }
 
-    resume_embeds = [embed_text_chunks(sec_text) for sec_text in resume_sections.values()]
+    resume_stored = extract_section_embeddings(resume_data)
+    resume_embeds = [section_embedding(sec, resume_sections, resume_stored) for sec in resume_sections]
     present_skills, missing_skills = [], []
 
     for skill in jd_skills:
@@ -2,10 +2,15 @@
 
 import os
 import re
-import json
+import shutil
+from itertools import groupby
+from typing import Iterable, Iterator, Tuple
+
 import fitz  # PyMuPDF
 import nltk
 
+from helpers.serialization import save_data, artifact_path
+
 # --- Ensure required NLTK tokenizers are available ---
 for resource in ["punkt", "punkt_tab"]:
     try:
@@ -18,6 +23,7 @@ for resource in ["punkt", "punkt_tab"]:
 # ----------------------------
 UPLOAD_DIR = "resumes"
 CHUNK_SIZE = 1500
+UPLOAD_COPY_BUFFER = 1024 * 1024  # bytes per read when saving uploads
 SECTION_HEADERS = [
     "summary", "objective", "education", "skills",
     "experience", "professional experience", "projects",
@@ -38,9 +44,36 @@ def save_uploaded_file(file) -> str:
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     file_path = os.path.join(UPLOAD_DIR, file.filename)
     with open(file_path, "wb") as f:
-        f.write(file.file.read())
+        # Copy in blocks so large uploads are never held in memory at once
+        shutil.copyfileobj(file.file, f, UPLOAD_COPY_BUFFER)
     return file_path
 
+# -----------------------------------------------------
+# Stream PDF text line by line
+# -----------------------------------------------------
+def iter_pdf_lines(file_path: str, read_error: str = "Error reading PDF",
+                   empty_error: str = "No text found in the uploaded PDF.") -> Iterator[str]:
+    """Yield text lines one page at a time; only a single page's text is held in memory."""
+    try:
+        doc = fitz.open(file_path)
+    except Exception as e:
+        raise RuntimeError(f"{read_error}: {e}")
+
+    found_text = False
+    with doc:
+        for page_number in range(doc.page_count):
+            try:
+                page_text = doc[page_number].get_text("text")
+            except Exception as e:
+                raise RuntimeError(f"{read_error}: {e}")
+            for line in page_text.splitlines():
+                if line.strip():
+                    found_text = True
+                yield line
+
+    if not found_text:
+        raise ValueError(empty_error)
+
 # -----------------------------------------------------
 # Normalize and clean text
 # -----------------------------------------------------
@@ -51,77 +84,106 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 # -----------------------------------------------------
-# Split resume into sections
+# Split into sections (streaming)
 # -----------------------------------------------------
-def split_into_sections(text: str) -> dict:
-    sections = {}
+def split_into_sections(lines: Iterable[str], headers=SECTION_HEADERS) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (section, normalized_line) for every content line.
+    A line containing one of `headers` switches the current section; a header
+    that appears again continues its section rather than replacing it.
+    """
     current_section = "general"
-    sections[current_section] = []
 
-    for line in text.splitlines():
+    for line in lines:
         line_clean = line.strip().lower()
         if not line_clean:
             continue
 
-        if any(header in line_clean for header in SECTION_HEADERS):
-            current_section = next((h for h in SECTION_HEADERS if h in line_clean), "general")
-            sections[current_section] = []
-        else:
-            sections[current_section].append(line.strip())
+        header = next((h for h in headers if h in line_clean), None)
+        if header:
+            current_section = header
+            continue
 
-    for key in sections:
-        joined = " ".join(sections[key])
-        sections[key] = normalize_text(joined)
-    return sections
+        normalized = normalize_text(line)
+        if normalized:
+            yield current_section, normalized
 
 # -----------------------------------------------------
-# Chunk text
+# Chunk text (streaming)
 # -----------------------------------------------------
-def chunk_text_for_embeddings(text: str, max_length=CHUNK_SIZE) -> list:
-    sentences = nltk.sent_tokenize(text)
-    chunks, current = [], ""
+def _split_long(text: str, max_length=CHUNK_SIZE) -> Iterator[str]:
+    """Cut `text` at word boundaries into pieces of at most `max_length` characters."""
+    while len(text) > max_length:
+        cut = text.rfind(" ", 0, max_length + 1)
+        cut = cut if cut > 0 else max_length
+        yield text[:cut]
+        text = text[cut:].lstrip()
+    if text:
+        yield text
+
+
+def iter_sentences(pieces: Iterable[str], max_length=CHUNK_SIZE) -> Iterator[str]:
+    """
+    Sentence-tokenize a stream of text pieces; every sentence yielded is at most
+    `max_length` characters. Text is buffered only until it spans ~2 chunks; the
+    trailing (possibly unfinished) sentence is carried into the next round, and
+    run-on text with no sentence boundary is cut at word boundaries so the
+    buffer stays bounded.
+    """
+    window = 2 * max_length
+    buffer = ""
+
+    for piece in pieces:
+        buffer = f"{buffer} {piece}" if buffer else piece
+        if len(buffer) < window:
+            continue
+
+        sentences = nltk.sent_tokenize(buffer)
+        buffer = sentences.pop() if sentences else ""
+        for sent in sentences:
+            yield from _split_long(sent, max_length)
+
+        if len(buffer) >= window:
+            # Run-on text: emit full-size pieces, carry only the last partial one
+            parts = list(_split_long(buffer, max_length))
+            buffer = parts.pop()
+            yield from parts
+
+    if buffer:
+        for sent in nltk.sent_tokenize(buffer):
+            yield from _split_long(sent, max_length)
+
+
+def chunk_text_for_embeddings(pieces: Iterable[str], max_length=CHUNK_SIZE) -> Iterator[str]:
+    """Pack streamed sentences into chunks of at most `max_length` characters."""
+    current = ""
 
-    for sent in sentences:
+    for sent in iter_sentences(pieces, max_length):
         if len(current) + len(sent) < max_length:
             current += " " + sent
         else:
-            chunks.append(current.strip())
+            if current.strip():
+                yield current.strip()
             current = sent
-    if current:
-        chunks.append(current.strip())
-
-    return chunks
+    if current.strip():
+        yield current.strip()
 
 # -----------------------------------------------------
-# Extract and structure RESUME
+# Stream sections -> chunks -> text files
 # -----------------------------------------------------
-def extract_text_from_pdf(file_path: str) -> dict:
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    try:
-        text = ""
-        with fitz.open(file_path) as doc:
-            for page in doc:
-                text += page.get_text("text")
-    except Exception as e:
-        raise RuntimeError(f"Error reading PDF: {e}")
-
-    if not text.strip():
-        raise ValueError("No text found in the uploaded PDF.")
-
-    sections = split_into_sections(text)
+def _save_structured_chunks(file_path: str, lines: Iterable[str], headers, json_suffix: str) -> dict:
+    """Stream lines into sections and chunks, writing each chunk file as soon as it is complete."""
     base_name = os.path.splitext(os.path.basename(file_path))[0]
     saved_files, chunk_metadata = {}, []
 
-    for section, content in sections.items():
-        if not content:
-            continue
-
-        chunks = chunk_text_for_embeddings(content)
+    # groupby is lazy: each run of consecutive lines in one section is chunked as it streams
+    for section, section_lines in groupby(split_into_sections(lines, headers), key=lambda item: item[0]):
         section_name = re.sub(r"[^a-zA-Z0-9_]", "_", section)
-        section_files = []
+        section_files = saved_files.setdefault(section, [])
 
-        for i, chunk in enumerate(chunks):
-            fname = f"{base_name}_{section_name}_{i+1}.txt"
+        for chunk in chunk_text_for_embeddings(line for _, line in section_lines):
+            chunk_index = len(section_files) + 1
+            fname = f"{base_name}_{section_name}_{chunk_index}.txt"
             text_path = os.path.join(UPLOAD_DIR, fname)
             with open(text_path, "w", encoding="utf-8") as f:
                 f.write(chunk)
@@ -129,13 +191,12 @@ def extract_text_from_pdf(file_path: str) -> dict:
 
             chunk_metadata.append({
                 "section": section,
-                "chunk_index": i + 1,
+                "chunk_index": chunk_index,
                 "text_path": text_path,
                 "text_preview": chunk[:200] + ("..." if len(chunk) > 200 else "")
             })
 
-        saved_files[section] = section_files
-
+    saved_files = {section: files for section, files in saved_files.items() if files}
     structured_output = {
         "file_name": os.path.basename(file_path),
         "sections": saved_files,
@@ -146,12 +207,19 @@ def extract_text_from_pdf(file_path: str) -> dict:
         }
     }
 
-    json_path = os.path.join(UPLOAD_DIR, f"{base_name}_structured.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(structured_output, f, indent=4, ensure_ascii=False)
+    artifact = artifact_path(os.path.join(UPLOAD_DIR, f"{base_name}{json_suffix}"))
+    save_data(structured_output, artifact)
 
     return structured_output
 
+# -----------------------------------------------------
+# Extract and structure RESUME
+# -----------------------------------------------------
+def extract_text_from_pdf(file_path: str) -> dict:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    lines = iter_pdf_lines(file_path)
+    return _save_structured_chunks(file_path, lines, SECTION_HEADERS, "_structured")
+
 # -----------------------------------------------------
 # Extract and structure JOB DESCRIPTION
 # -----------------------------------------------------
@@ -161,76 +229,6 @@ def extract_jd_from_pdf(file_path: str) -> dict:
     chunks for embeddings, and saves structured data.
     """
     os.makedirs(UPLOAD_DIR, exist_ok=True)
-    try:
-        text = ""
-        with fitz.open(file_path) as doc:
-            for page in doc:
-                text += page.get_text("text")
-    except Exception as e:
-        raise RuntimeError(f"Error reading JD PDF: {e}")
-
-    if not text.strip():
-        raise ValueError("No text found in the JD PDF.")
-
-    # Identify JD-like sections
-    sections = {}
-    current_section = "general"
-    sections[current_section] = []
-
-    for line in text.splitlines():
-        line_clean = line.strip().lower()
-        if not line_clean:
-            continue
-        if any(header in line_clean for header in JD_HEADERS):
-            current_section = next((h for h in JD_HEADERS if h in line_clean), "general")
-            sections[current_section] = []
-        else:
-            sections[current_section].append(line.strip())
-
-    for key in sections:
-        joined = " ".join(sections[key])
-        sections[key] = normalize_text(joined)
-
-    # Chunk & save
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-    saved_files, chunk_metadata = {}, []
-
-    for section, content in sections.items():
-        if not content:
-            continue
-
-        chunks = chunk_text_for_embeddings(content)
-        section_name = re.sub(r"[^a-zA-Z0-9_]", "_", section)
-        section_files = []
-
-        for i, chunk in enumerate(chunks):
-            fname = f"{base_name}_{section_name}_{i+1}.txt"
-            text_path = os.path.join(UPLOAD_DIR, fname)
-            with open(text_path, "w", encoding="utf-8") as f:
-                f.write(chunk)
-            section_files.append(text_path)
-
-            chunk_metadata.append({
-                "section": section,
-                "chunk_index": i + 1,
-                "text_path": text_path,
-                "text_preview": chunk[:200] + ("..." if len(chunk) > 200 else "")
-            })
-
-        saved_files[section] = section_files
-
-    structured_output = {
-        "file_name": os.path.basename(file_path),
-        "sections": saved_files,
-        "metadata": {
-            "total_sections": len(saved_files),
-            "total_chunks": sum(len(v) for v in saved_files.values()),
-            "chunks": chunk_metadata
-        }
-    }
-
-    json_path = os.path.join(UPLOAD_DIR, f"{base_name}_JD_structured.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(structured_output, f, indent=4, ensure_ascii=False)
-
-    return structured_output
+    lines = iter_pdf_lines(file_path, read_error="Error reading JD PDF",
+                           empty_error="No text found in the JD PDF.")
+    return _save_structured_chunks(file_path, lines, JD_HEADERS, "_JD_structured")
@@ -1,7 +1,9 @@
 import os
 import re
-import json
 from datetime import datetime
+from typing import Iterator, List
+
+from helpers.serialization import load_data, save_data, artifact_path
 
 def clean_text(text: str) -> str:
     """Cleans text for embedding: removes URLs, extra spaces, etc."""
@@ -10,38 +12,61 @@ def clean_text(text: str) -> str:
     return text
 
 
-def process_resume_json(input_json_path: str, output_dir: str = "data/processed") -> str:
-    """Takes the parsed resume JSON, cleans and prepares it for embedding."""
+def iter_section_texts(paths: List[str]) -> Iterator[str]:
+    """Yield the cleaned text of each chunk file, reading one file at a time."""
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as txt_file:
+                cleaned = clean_text(txt_file.read())
+            if cleaned:
+                yield cleaned
+        else:
+            print(f"⚠️ Warning: Missing file {path}")
+
+
+def process_resume_json(input_json_path: str, output_dir: str = "data/processed",
+                        fmt: str = None, include_embeddings: bool = False) -> str:
+    """
+    Takes the parsed resume JSON, cleans and prepares it for embedding.
+    Output is written as JSON or msgpack (`fmt`); with `include_embeddings`
+    each section also carries its mean embedding vector.
+    """
 
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    with open(input_json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_data(input_json_path)
+
+    if include_embeddings:
+        # Imported lazily: loading the embedding model is expensive.
+        from helpers import embedding_utils
 
     processed_sections = []
 
     for section, paths in data["sections"].items():
-        combined_text = ""
-        for path in paths:
-            if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as txt_file:
-                    content = txt_file.read()
-                    combined_text += " " + clean_text(content)
-            else:
-                print(f"⚠️ Warning: Missing file {path}")
-
-        processed_sections.append({
+        # Join once instead of repeatedly concatenating (quadratic on long sections)
+        pieces = list(iter_section_texts(paths))
+        combined_text = " ".join(pieces)
+
+        section_entry = {
             "id": f"{data['file_name'].replace('.pdf', '')}_{section}",
             "section": section,
-            "text": combined_text.strip(),
+            "text": combined_text,
             "metadata": {
                 "resume_owner": data["file_name"].replace(".pdf", ""),
                 "source_files": paths,
-                "tokens": len(combined_text.split()),
+                "tokens": sum(len(piece.split()) for piece in pieces),
                 "processed_at": datetime.now().isoformat()
             }
-        })
+        }
+        if include_embeddings:
+            # Same cleaned text the scorer embeds, so scoring can reuse the stored vector
+            scoring_pieces = (embedding_utils.clean_text(piece) for piece in pieces)
+            section_entry["embedding"] = embedding_utils.embed_text_chunks(scoring_pieces).cpu().numpy()
+            # Lets the scorer ignore vectors from a different model
+            section_entry["metadata"].update(embedding_utils.encoder_info())
+
+        processed_sections.append(section_entry)
 
     output_data = {
         "file_name": data["file_name"],
@@ -52,16 +77,15 @@ def process_resume_json(input_json_path: str, output_dir: str = "data/processed"
         }
     }
 
-    output_path = os.path.join(output_dir, f"{data['file_name'].replace('.pdf', '')}_processed.json")
-    with open(output_path, "w", encoding="utf-8") as out_file:
-        json.dump(output_data, out_file, indent=4)
+    output_path = artifact_path(os.path.join(output_dir, f"{data['file_name'].replace('.pdf', '')}_processed"), fmt)
+    save_data(output_data, output_path)
 
     print(f"✅ Processed resume saved to {output_path}")
     return output_path
 
 
-def batch_process_all(input_dir: str = "data/resume_jsons", output_dir: str = "data/processed"):
+def batch_process_all(input_dir: str = "data/resume_jsons", output_dir: str = "data/processed", fmt: str = None):
     """Optional: process all resume JSONs in a directory."""
     for file in os.listdir(input_dir):
-        if file.endswith(".json"):
-            process_resume_json(os.path.join(input_dir, file), output_dir)
+        if file.endswith((".json", ".msgpack")):
+            process_resume_json(os.path.join(input_dir, file), output_dir, fmt)
@@ -0,0 +1,177 @@
+# helpers/serialization.py
+
+import os
+import json
+import math
+
+import numpy as np
+
+# --- Optional fast encoders (fall back to the stdlib when missing) ---
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# ----------------------------
+# Config
+# ----------------------------
+FORMAT_JSON = "json"
+FORMAT_MSGPACK = "msgpack"
+
+FORMAT_EXTENSIONS = {
+    FORMAT_JSON: ".json",
+    FORMAT_MSGPACK: ".msgpack",
+}
+
+# msgpack extension code for float32 vectors (embeddings)
+_NDARRAY_EXT = 1
+
+
+class SerializationError(ValueError):
+    """Raised when an artifact cannot be encoded or decoded."""
+
+
+# Format used when writing new artifacts; reading always auto-detects.
+# Checked at import so a typo fails at startup, not after chunk files are written.
+DEFAULT_FORMAT = os.getenv("ATS_ARTIFACT_FORMAT", FORMAT_JSON).strip().lower()
+if DEFAULT_FORMAT not in FORMAT_EXTENSIONS:
+    raise SerializationError(
+        f"Invalid ATS_ARTIFACT_FORMAT={DEFAULT_FORMAT!r}; expected one of: {', '.join(FORMAT_EXTENSIONS)}"
+    )
+if DEFAULT_FORMAT == FORMAT_MSGPACK and msgpack is None:
+    raise SerializationError("ATS_ARTIFACT_FORMAT=msgpack requires msgpack; run `pip install msgpack`.")
+
+
+# -----------------------------------------------------
+# JSON
+# -----------------------------------------------------
+def dumps_json(data) -> bytes:
+    """
+    Compact JSON bytes, using orjson when available.
+    NaN/Infinity are written as null on both paths (orjson's behaviour).
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        _finite_or_none(data), ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+
+
+def loads_json(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _finite_or_none(obj):
+    """Replace non-finite floats with None, matching orjson for the stdlib fallback."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite_or_none(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite_or_none(v) for v in obj]
+    return obj
+
+
+def _json_default(obj):
+    if isinstance(obj, np.ndarray):
+        return _finite_or_none(obj.tolist())
+    if isinstance(obj, np.generic):
+        return _finite_or_none(obj.item())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# -----------------------------------------------------
+# msgpack (embeddings packed as raw float32 bytes)
+# -----------------------------------------------------
+def _msgpack_default(obj):
+    if isinstance(obj, np.ndarray):
+        return msgpack.ExtType(_NDARRAY_EXT, obj.astype("<f4").tobytes())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable")
+
+
+def _msgpack_ext_hook(code, data):
+    if code == _NDARRAY_EXT:
+        return np.frombuffer(data, dtype="<f4").tolist()
+    return msgpack.ExtType(code, data)
+
+
+def dumps_msgpack(data) -> bytes:
+    if msgpack is None:
+        raise SerializationError("msgpack is not installed; run `pip install msgpack`.")
+    return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+
+
+def loads_msgpack(raw: bytes):
+    if msgpack is None:
+        raise SerializationError("msgpack is not installed; run `pip install msgpack`.")
+    return msgpack.unpackb(raw, ext_hook=_msgpack_ext_hook, raw=False)
+
+
+# -----------------------------------------------------
+# Format detection
+# -----------------------------------------------------
+def detect_format(path: str, raw: bytes = None) -> str:
+    """Detect artifact format by sniffing `raw` when given, else from the file extension."""
+    if raw is not None:
+        # JSON artifacts always start with an object/array; msgpack maps never do.
+        head = raw.lstrip()[:1]
+        return FORMAT_JSON if head in (b"{", b"[") else FORMAT_MSGPACK
+
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, fmt_ext in FORMAT_EXTENSIONS.items():
+        if ext == fmt_ext:
+            return fmt
+    return DEFAULT_FORMAT
+
+
+def artifact_path(base_path: str, fmt: str = None) -> str:
+    """Append the extension for `fmt` to a path without one."""
+    fmt = fmt or DEFAULT_FORMAT
+    if fmt not in FORMAT_EXTENSIONS:
+        raise SerializationError(f"Unknown artifact format: {fmt}")
+    return base_path + FORMAT_EXTENSIONS[fmt]
+
+
+# -----------------------------------------------------
+# Save / load artifacts
+# -----------------------------------------------------
+def save_data(data, path: str, fmt: str = None) -> str:
+    """Write `data` to `path` in the given format (detected from extension if omitted)."""
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMAT_EXTENSIONS:
+        raise SerializationError(f"Unknown artifact format: {fmt}")
+    try:
+        raw = dumps_msgpack(data) if fmt == FORMAT_MSGPACK else dumps_json(data)
+    except SerializationError:
+        raise
+    except TypeError as e:
+        raise SerializationError(f"Could not encode {path}: {e}")
+
+    with open(path, "wb") as f:
+        f.write(raw)
+    return path
+
+
+def load_data(path: str):
+    """Read an artifact written by `save_data` (or any plain JSON file), auto-detecting the format."""
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    fmt = detect_format(path, raw)
+    try:
+        if fmt == FORMAT_MSGPACK:
+            return loads_msgpack(raw)
+        return loads_json(raw)
+    except SerializationError:
+        raise
+    except Exception as e:
+        raise SerializationError(f"Invalid {fmt} content in {path}: {e}")